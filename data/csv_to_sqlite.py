@@ -14,13 +14,20 @@ df = df.drop(columns=["captured_at", "author"])
 # drop rare columns
 df = df.drop(columns=["equipment"])
 # drop duplicate & computable columns
-df = df.drop(
-    columns=["protein_grams", "fat_grams", "carb_grams", "calories", "calories_total"]
-)
+df = df.drop(columns=["calories", "calories_total"])
 # rename columns for compatibility
 df = df.rename(columns={"instructions": "directions", "url": "link"})
+# coerce nutrition (per 100 g) & time columns to numbers, these are optional
+float_columns = ["protein_grams", "fat_grams", "carb_grams", "calories_per_100g"]
+int_columns = ["total_time", "servings"]
+for column in float_columns:
+    df[column] = pd.to_numeric(df[column], errors="coerce")
+for column in int_columns:
+    df[column] = pd.to_numeric(df[column], errors="coerce").round().astype("Int64")
 # drop recipes with missing data
-recipes_df = df.dropna().copy()
+recipes_df = df.dropna(
+    subset=[c for c in df.columns if c not in float_columns + int_columns]
+).copy()
 # add index
 recipes_df["id"] = recipes_df.index.copy()
 
@@ -68,9 +75,9 @@ for id, row in recipes_df.iterrows():
     for tag in tags:
         recipe_to_tag.append({"tag": tag, "recipe_id": id})
 
-recipe_to_tag = pd.DataFrame(recipe_to_tag)
+recipe_to_tag = pd.DataFrame(recipe_to_tag).drop_duplicates()
 tags = recipe_to_tag[["tag"]].drop_duplicates().copy()
-print(f"unique tags: {len(tag)}")
+print(f"unique tags: {len(tags)}")
 print(f"recipe / tag links: {len(recipe_to_tag)}")
 
 # convert relation to ids
@@ -78,6 +85,7 @@ tags["id"] = tags.index.copy()
 recipe_to_tag = recipe_to_tag.merge(tags, on="tag")
 recipe_to_tag = recipe_to_tag.rename(columns={"id": "tag_id"})
 recipe_to_tag = recipe_to_tag.drop(columns=["tag"])
+tags = tags.rename(columns={"tag": "name"})
 recipes_df = recipes_df.drop(columns=["tags"])
 
 
@@ -92,7 +100,11 @@ recipes_df.to_sql(
     conn,
     if_exists="replace",
     index=False,
-    dtype={"id": "INTEGER PRIMARY KEY"},
+    dtype={
+        "id": "INTEGER PRIMARY KEY",
+        **{column: "REAL" for column in float_columns},
+        **{column: "INTEGER" for column in int_columns},
+    },
 )
 
 ingredients[["id", "name"]].to_sql(
@@ -118,8 +130,59 @@ recipe_to_ingredient.to_sql(
     },
 )
 
+tags[["id", "name"]].to_sql(
+    "tags",
+    conn,
+    if_exists="replace",
+    index=False,
+    dtype={"id": "INTEGER PRIMARY KEY"},
+)
+
+recipe_to_tag.to_sql(
+    "recipe_tags",
+    conn,
+    if_exists="replace",
+    index=False,
+    dtype={
+        "recipe_id": "INTEGER",
+        "tag_id": "INTEGER",
+        "FOREIGN KEY (recipe_id)": "REFERENCES recipes(id)",
+        "FOREIGN KEY (tag_id)": "REFERENCES tags(id)",
+        "PRIMARY KEY": "(recipe_id, tag_id)",
+    },
+)
+
 # Create indexes for better performance
 cursor = conn.cursor()
+# range filters: crud.filter_recipes selects only ids per range, and id is the
+# rowid, so each single-column index fully covers its subquery.
+# Index names match the ones declared in models.py
+for column in float_columns + int_columns:
+    cursor.execute(
+        f"""
+            CREATE INDEX IF NOT EXISTS ix_recipes_{column}
+            ON recipes({column})
+        """
+    )
+cursor.execute(
+    """
+        CREATE UNIQUE INDEX IF NOT EXISTS ix_tags_name
+        ON tags(name)
+    """
+)
+# stands in for the (recipe_id, tag_id) primary key that to_sql doesn't create
+cursor.execute(
+    """
+        CREATE INDEX IF NOT EXISTS idx_recipe_tags_recipe_id
+        ON recipe_tags(recipe_id)
+    """
+)
+cursor.execute(
+    """
+        CREATE INDEX IF NOT EXISTS ix_recipe_tags_tag_id
+        ON recipe_tags(tag_id, recipe_id)
+    """
+)
 cursor.execute(
     """
         CREATE INDEX IF NOT EXISTS idx_recipe_ingredients_recipe_id
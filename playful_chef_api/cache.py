@@ -0,0 +1,34 @@
+from collections import OrderedDict
+from threading import Lock
+
+
+class RecipeCache:
+    """Small in-process LRU of serialized recipes keyed by id.
+
+    The database is read-only between rebuilds, so entries never go stale
+    while the process is alive.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = Lock()
+
+    def get_many(self, ids: list[int]) -> dict:
+        """Return cached recipes for ids, marking them as recently used"""
+        found = {}
+        with self._lock:
+            for id in ids:
+                if id in self._items:
+                    self._items.move_to_end(id)
+                    found[id] = self._items[id]
+        return found
+
+    def put_many(self, recipes: dict):
+        """Store recipes, evicting the least recently used ones"""
+        with self._lock:
+            for id, recipe in recipes.items():
+                self._items[id] = recipe
+                self._items.move_to_end(id)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
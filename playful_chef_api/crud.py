@@ -1,13 +1,74 @@
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import func, select
 from playful_chef_api import models
-from playful_chef_api.models import Recipe, recipe_ingredient, Ingredient
+from playful_chef_api.models import Recipe, recipe_ingredient, Ingredient, Tag
 
+# Recipe columns that support min_<name> / max_<name> range filters
+RANGE_FILTER_COLUMNS = {
+    "protein_grams": Recipe.protein_grams,
+    "fat_grams": Recipe.fat_grams,
+    "carb_grams": Recipe.carb_grams,
+    "calories_per_100g": Recipe.calories_per_100g,
+    "total_time": Recipe.total_time,
+    "servings": Recipe.servings,
+}
 
-def get_random_recipes(db: Session, limit: int = 10):
+
+def filter_recipes(query, tags: list[str] | None = None, **bounds):
+    """
+    Restrict a recipe query by tags and numeric ranges.
+
+    Args:
+        query: Query selecting Recipe
+        tags: Tag names, recipes must have all of them
+        **bounds: min_<column> / max_<column> values, see RANGE_FILTER_COLUMNS
+
+    Returns:
+        The filtered query
+
+    Raises:
+        ValueError: If the database predates a requested filter
+    """
+    for name, column in RANGE_FILTER_COLUMNS.items():
+        low = bounds.pop(f"min_{name}", None)
+        high = bounds.pop(f"max_{name}", None)
+        if low is None and high is None:
+            continue
+        if name in models.unavailable_columns:
+            raise ValueError(f"Rebuild the database to filter by {name}")
+        # Select only ids, so each range is answered from its index alone
+        # (id is the rowid) and several ranges intersect without row lookups
+        range_ids = select(Recipe.id).correlate(None)
+        if low is not None:
+            range_ids = range_ids.where(column >= low)
+        if high is not None:
+            range_ids = range_ids.where(column <= high)
+        query = query.filter(Recipe.id.in_(range_ids))
+    if bounds:
+        raise TypeError(f"Unknown recipe filters: {', '.join(bounds)}")
+
+    if tags:
+        if not models.tags_available:
+            raise ValueError("Rebuild the database to filter by tags")
+        tag_names = {tag.lower() for tag in tags}
+        tagged_recipes = (
+            select(models.recipe_tag.c.recipe_id)
+            .join(Tag, models.recipe_tag.c.tag_id == Tag.id)
+            .where(Tag.name.in_(tag_names))
+            .group_by(models.recipe_tag.c.recipe_id)
+            .having(func.count(Tag.id) == len(tag_names))
+        )
+        query = query.filter(Recipe.id.in_(tagged_recipes))
+
+    return query
+
+
+def get_random_recipes(
+    db: Session, limit: int = 10, tags: list[str] | None = None, **bounds
+):
     """Get random recipes from the database with their ingredients"""
     return (
-        db.query(models.Recipe)
+        filter_recipes(db.query(models.Recipe), tags=tags, **bounds)
         .order_by(func.random())
         .limit(limit)
         .options(joinedload(models.Recipe.ingredients))
@@ -25,8 +86,38 @@ def get_recipe_by_id(db: Session, id: int):
     )
 
 
+def get_recipes_by_ids(db: Session, ids: list[int]):
+    """
+    Get recipes with their ingredients for a batch of ids.
+
+    Loads recipes and ingredients in two set-based queries instead of one
+    joined query per id.
+
+    Args:
+        db: Database session
+        ids: Recipe ids to fetch
+
+    Returns:
+        Dict mapping recipe id to Recipe object, missing ids are absent
+    """
+    if not ids:
+        return {}
+    recipes = (
+        db.query(models.Recipe)
+        .where(Recipe.id.in_(set(ids)))
+        .options(selectinload(models.Recipe.ingredients))
+        .all()
+    )
+    return {recipe.id: recipe for recipe in recipes}
+
+
 def get_recipes_by_ingredients(
-    db: Session, ingredient_names: list[str], cutoff: float = 0.5, limit: int = 10
+    db: Session,
+    ingredient_names: list[str],
+    cutoff: float = 0.5,
+    limit: int = 10,
+    tags: list[str] | None = None,
+    **bounds,
 ):
     """
     Returns recipes where at least 'cutoff' ingredients are in ingredient_names.
@@ -36,6 +127,8 @@ def get_recipes_by_ingredients(
         ingredient_names: List of ingredient names to match
         cutoff: Minimum percentage of matching ingredients (0.0 to 1.0)
         limit: Maximum number of recipes to return
+        tags: Optional tag names, see filter_recipes
+        **bounds: Optional range filters, see filter_recipes
 
     Returns:
         List of Recipe objects that meet the cutoff criteria
@@ -67,7 +160,7 @@ def get_recipes_by_ingredients(
 
     # Main query to find recipes that meet the cutoff
     recipes = (
-        db.query(Recipe)
+        filter_recipes(db.query(Recipe), tags=tags, **bounds)
         .join(total_ingredients_subq, Recipe.id == total_ingredients_subq.c.recipe_id)
         .outerjoin(
             matching_ingredients_subq,
@@ -1,15 +1,25 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 # SQLite database URL
 SQLALCHEMY_DATABASE_URL = "sqlite:///./data/database.db"
+# Memory-map the database so workers share pages through the OS page cache
+SQLITE_MMAP_SIZE = 256 * 1024 * 1024
 
 # Create engine
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
 )
 
+
+@event.listens_for(engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    cursor.close()
+
+
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -17,6 +27,17 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+def existing_columns(table_name: str) -> set[str] | None:
+    """Columns of a table in the database file, None if there is no such table.
+
+    database.db is built by data/csv_to_sqlite.py and never altered by the API,
+    so an older build can lack columns and tables that the models define."""
+    inspector = inspect(engine)
+    if not inspector.has_table(table_name):
+        return None
+    return {column["name"] for column in inspector.get_columns(table_name)}
+
+
 # Dependency to get database session
 def get_db():
     db = SessionLocal()
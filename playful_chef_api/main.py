@@ -1,21 +1,37 @@
-from fastapi import FastAPI, Depends, Query
+import os
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, HTTPException, Query
+from sqlalchemy import inspect
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Annotated, List
 
 from playful_chef_api import models, schemas, crud
 from playful_chef_api.database import engine, get_db
 from playful_chef_api.model import RecipeAgent
+from playful_chef_api.cache import RecipeCache
 
 Agent = RecipeAgent()
+recipe_cache = RecipeCache()
+
+# Create database tables, an existing database.db is read-only
+if not inspect(engine).has_table("recipes"):
+    models.Base.metadata.create_all(bind=engine)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Runs in every worker process, after playful_chef_api.server forks
+    engine.dispose(close=False)
+    Agent.rag_agent.init_worker(int(os.getenv("WORKER_THREADS", "0")))
+    yield
 
-# Create database tables
-models.Base.metadata.create_all(bind=engine)
 
 # Create FastAPI application instance
 app = FastAPI(
     title="Recipe API",
     description="A FastAPI application for recipes with SQLite database",
     version="1.0.0",
+    lifespan=lifespan,
 )
 inputs = {"messages": []}
 
@@ -39,29 +55,59 @@ async def get_agent_recipes(
 
 @app.get("/recipes", response_model=List[schemas.Recipe])
 async def get_random_recipes(
+    query: Annotated[schemas.RecipeQuery, Query()],
     db: Session = Depends(get_db),
-    limit: int = 10,
-    ingredients: Optional[List[str]] = Query(
-        None, description="Filter recipes by ingredients"
-    ),
 ):
     """
     Get random recipes from the database.
 
     - **limit**: Number of random recipes to return (default: 10)
     - **ingredients**: Optional list of ingredients to filter recipes
+    - **tags**: Optional list of tags, recipes must have all of them
+    - **min_<field>**, **max_<field>**: Optional inclusive ranges for nutrition
+      per 100 g, total_time and servings
     """
-    if ingredients:
-        print(ingredients)
-        recipes = crud.get_recipes_by_ingredients(
-            db, ingredient_names=ingredients, limit=limit
-        )
-    else:
-        recipes = crud.get_random_recipes(db, limit=limit)
+    filters = query.model_dump(exclude_none=True, exclude={"limit", "ingredients"})
+    try:
+        if query.ingredients:
+            print(query.ingredients)
+            recipes = crud.get_recipes_by_ingredients(
+                db, ingredient_names=query.ingredients, limit=query.limit, **filters
+            )
+        else:
+            recipes = crud.get_random_recipes(db, limit=query.limit, **filters)
+    except ValueError as error:
+        raise HTTPException(status_code=503, detail=str(error))
 
     return recipes
 
 
+@app.post("/recipes/batch", response_model=schemas.RecipeBatchResponse)
+async def get_recipes_batch(
+    request: schemas.RecipeBatchRequest, db: Session = Depends(get_db)
+):
+    """
+    Get several recipes by id in one round trip.
+
+    - **ids**: Recipe ids, returned in request order
+    - **missing**: ids that are not in the database
+    """
+    found = recipe_cache.get_many(request.ids)
+    uncached = [id for id in dict.fromkeys(request.ids) if id not in found]
+    if uncached:
+        loaded = {
+            id: schemas.Recipe.model_validate(recipe)
+            for id, recipe in crud.get_recipes_by_ids(db, ids=uncached).items()
+        }
+        recipe_cache.put_many(loaded)
+        found.update(loaded)
+
+    return schemas.RecipeBatchResponse(
+        recipes=[found[id] for id in request.ids if id in found],
+        missing=[id for id in dict.fromkeys(request.ids) if id not in found],
+    )
+
+
 @app.get("/recipes/{id}", response_model=schemas.Recipe)
 async def get_recipe_by_id(id: int, db: Session = Depends(get_db)):
     return crud.get_recipe_by_id(db, id=id)
@@ -2,13 +2,18 @@ from langchain_openai import ChatOpenAI
 from pydantic import BaseModel, Field
 from langchain.tools import tool
 from langchain_community.vectorstores import FAISS
-from playful_chef_api.crud import get_recipes_by_ingredients
-from typing import List
+from playful_chef_api.crud import get_recipes_by_ingredients, get_random_recipes
+from playful_chef_api.schemas import RecipeFilter
+from typing import List, Optional
 from langgraph.prebuilt import create_react_agent
 import yaml
 import openai
+import faiss
+import onnxruntime
 import os
+from pathlib import Path
 from light_embed import TextEmbedding
+from light_embed.modules import OrtText
 
 
 with open("playful_chef_api/config.yml", "r", encoding="utf-8") as file:
@@ -74,27 +79,79 @@ class DataBaseInput(BaseModel):
     )
 
 
+class FilterInput(RecipeFilter):
+    tags: Optional[List[str]] = Field(
+        default=None,
+        description="""Теги рецепта, у рецепта должны быть ВСЕ указанные теги.
+
+        Используй только если пользователь явно называет тип блюда или повод:
+        ["завтрак"], ["суп"], ["десерт", "без выпечки"]
+        """,
+    )
+
+
 class RagResponseFormat(BaseModel):
     dish_id: int = Field(..., description="Номер самого подходящего блюда")
 
 
+class ThreadedOrtText(OrtText):
+    """ONNX-модуль light_embed с заданным числом потоков.
+
+    light_embed не принимает SessionOptions, поэтому сессию создаем сами,
+    а вызов модели и разбор выходов наследуем от OrtText."""
+
+    def __init__(self, model_path, num_threads: int, output_name_map=None):
+        session_options = onnxruntime.SessionOptions()
+        session_options.graph_optimization_level = (
+            onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        )
+        session_options.intra_op_num_threads = num_threads
+        self._session = onnxruntime.InferenceSession(
+            str(model_path), session_options, providers=["CPUExecutionProvider"]
+        )
+        if output_name_map:
+            self.output_name_map = {**self.output_name_map, **output_name_map}
+
+
 class RAGAgent:
     def __init__(self, index_path, embedder_path):
+        # ONNX-сессия создается в каждом воркере, см. init_worker
+        self.embedder = None
+
+        self.index = FAISS.load_local(
+            index_path,
+            lambda a: self.embedder.encode(a),
+            allow_dangerous_deserialization=True,
+        )  # загрузка локальной бд
+
+    def init_worker(self, num_threads: int = 0):
+        """Готовит процесс воркера: задает число потоков FAISS и загружает
+        ONNX-эмбеддер. Пулы потоков не переживают fork, поэтому вызывается
+        в воркере, а не в родителе. 0 - число потоков по умолчанию."""
+        if self.embedder is not None:
+            return
+        if num_threads:
+            faiss.omp_set_num_threads(num_threads)
+
         print("Init embedder...")
         model_name = "onnx-models/paraphrase-multilingual-MiniLM-L12-v2-onnx"
-        self.embedder = TextEmbedding(
+        embedder = TextEmbedding(
             model_name,
             model_config={"onnx_file": "model.onnx"},
             cache_folder="index/sentence-transformers",
         )
+        if num_threads:
+            # Заменяем ONNX-модуль на сессию с нужным числом потоков,
+            # модель при этом загружается повторно один раз при старте
+            onnx_path = Path(embedder.model_dir, embedder.model_config["onnx_file"])
+            embedder.modules[0] = ThreadedOrtText(
+                onnx_path,
+                num_threads,
+                output_name_map=embedder.model_config.get("onnx_output_map"),
+            )
+        self.embedder = embedder
         print("Embedder ready")
 
-        self.index = FAISS.load_local(
-            index_path,
-            lambda a: self.embedder.encode(a),
-            allow_dangerous_deserialization=True,
-        )  # загрузка локальной бд
-
     def go_rag(self, query: str, k=3):
         if isinstance(query, list):
             query = " ".join(query)
@@ -114,7 +171,11 @@ class RecipeAgent:
         self.rag_agent = RAGAgent(index_path=index_path, embedder_path=embedder_path)
 
         # Создаем инструменты
-        self.tools = [self._create_rag_tool(), self._create_db_tool()]
+        self.tools = [
+            self._create_rag_tool(),
+            self._create_db_tool(),
+            self._create_filter_tool(),
+        ]
 
         # Создаем агента
         self.agent = create_react_agent(
@@ -191,6 +252,29 @@ class RecipeAgent:
 
         return get_recipes_from_db
 
+    def _create_filter_tool(self):
+        """Создает инструмент для поиска по тегам, КБЖУ и времени"""
+
+        @tool(
+            "get_recipes_by_filters",
+            args_schema=FilterInput,
+            return_direct=True,
+            parse_docstring=True,
+            description=config["get_recipes_by_filters_description"],
+        )
+        def get_recipes_by_filters(**filters) -> str:
+            print("get_recipes_by_filters")
+
+            # Один индексированный SQL-запрос без RAG и LLM
+            try:
+                response = get_random_recipes(self.db, **filters)
+            except ValueError:
+                return "Поиск по этим фильтрам пока недоступен"
+            result = [f"{i.title}\n{i.link}" for i in response]
+            return "\n".join(result)
+
+        return get_recipes_by_filters
+
     def invoke(self, inputs: dict, db):
         """Вызов агента"""
         self.db = db
@@ -1,6 +1,22 @@
-from sqlalchemy import Column, Integer, Float, Text, Table, ForeignKey
-from sqlalchemy.orm import relationship
-from playful_chef_api.database import Base
+from sqlalchemy import Column, Integer, Float, Text, Table, ForeignKey, Index, null
+from sqlalchemy.orm import relationship, column_property
+from playful_chef_api.database import Base, existing_columns
+
+# database.db is read-only, so map only what its build provides. No recipes
+# table means a new, empty database that create_all will fill in
+_recipe_columns = existing_columns("recipes")
+tags_available = _recipe_columns is None or existing_columns("recipe_tags") is not None
+# Recipe columns that an older database.db lacks, they read as NULL
+unavailable_columns = set()
+
+
+def built_column(name: str, type_):
+    """Indexed recipe column, mapped to NULL if the database predates it"""
+    if _recipe_columns is None or name in _recipe_columns:
+        return Column(type_, index=True)
+    unavailable_columns.add(name)
+    return column_property(null())
+
 
 # Association table for many-to-many relationship between recipes and ingredients
 recipe_ingredient = Table(
@@ -12,6 +28,16 @@ recipe_ingredient = Table(
     Column("ingredient_id", Integer, ForeignKey("ingredients.id"), primary_key=True),
 )
 
+# Association table for many-to-many relationship between recipes and tags
+recipe_tag = Table(
+    "recipe_tags",
+    Base.metadata,
+    Column("recipe_id", Integer, ForeignKey("recipes.id"), primary_key=True),
+    Column("tag_id", Integer, ForeignKey("tags.id"), primary_key=True),
+    # Covers tag lookups, the primary key covers lookups by recipe
+    Index("ix_recipe_tags_tag_id", "tag_id", "recipe_id"),
+)
+
 
 class Recipe(Base):
     __tablename__ = "recipes"
@@ -21,11 +47,22 @@ class Recipe(Base):
     directions = Column(Text)
     link = Column(Text)
 
+    # Nutrition per 100 g and cooking time in minutes, indexed for range filters
+    protein_grams = built_column("protein_grams", Float)
+    fat_grams = built_column("fat_grams", Float)
+    carb_grams = built_column("carb_grams", Float)
+    calories_per_100g = built_column("calories_per_100g", Float)
+    total_time = built_column("total_time", Integer)
+    servings = built_column("servings", Integer)
+
     # Relationship to ingredients through the association table
     ingredients = relationship(
         "Ingredient", secondary=recipe_ingredient, back_populates="recipes"
     )
 
+    # Relationship to tags through the association table
+    tags = relationship("Tag", secondary=recipe_tag, back_populates="recipes")
+
 
 class Ingredient(Base):
     __tablename__ = "ingredients"
@@ -37,3 +74,13 @@ class Ingredient(Base):
     recipes = relationship(
         "Recipe", secondary=recipe_ingredient, back_populates="ingredients"
     )
+
+
+class Tag(Base):
+    __tablename__ = "tags"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(Text, nullable=False, unique=True, index=True)
+
+    # Relationship to recipes through the association table
+    recipes = relationship("Recipe", secondary=recipe_tag, back_populates="tags")
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
 
 
@@ -20,12 +20,76 @@ class Recipe(BaseModel):
     link: Optional[str] = None
     source: Optional[str] = None
     site: Optional[str] = None
+    protein_grams: Optional[float] = Field(None, description="Protein per 100 g, g")
+    fat_grams: Optional[float] = Field(None, description="Fat per 100 g, g")
+    carb_grams: Optional[float] = Field(None, description="Carbs per 100 g, g")
+    calories_per_100g: Optional[float] = Field(
+        None, description="Energy per 100 g, kcal"
+    )
+    total_time: Optional[int] = Field(None, description="Cooking time, minutes")
+    servings: Optional[int] = Field(None, description="Number of servings")
     ingredients: List[Ingredient] = []
 
     class Config:
         from_attributes = True
 
 
+# Filters for recipe lookups, range bounds are inclusive
+class RecipeFilter(BaseModel):
+    min_protein_grams: Optional[float] = Field(
+        None, description="Minimum protein per 100 g, g"
+    )
+    max_protein_grams: Optional[float] = Field(
+        None, description="Maximum protein per 100 g, g"
+    )
+    min_fat_grams: Optional[float] = Field(None, description="Minimum fat per 100 g, g")
+    max_fat_grams: Optional[float] = Field(None, description="Maximum fat per 100 g, g")
+    min_carb_grams: Optional[float] = Field(
+        None, description="Minimum carbs per 100 g, g"
+    )
+    max_carb_grams: Optional[float] = Field(
+        None, description="Maximum carbs per 100 g, g"
+    )
+    min_calories_per_100g: Optional[float] = Field(
+        None, description="Minimum energy per 100 g, kcal"
+    )
+    max_calories_per_100g: Optional[float] = Field(
+        None, description="Maximum energy per 100 g, kcal"
+    )
+    min_total_time: Optional[int] = Field(
+        None, description="Minimum cooking time, minutes"
+    )
+    max_total_time: Optional[int] = Field(
+        None, description="Maximum cooking time, minutes"
+    )
+    min_servings: Optional[int] = Field(None, description="Minimum number of servings")
+    max_servings: Optional[int] = Field(None, description="Maximum number of servings")
+    tags: Optional[List[str]] = Field(
+        None, description="Tags, recipes must have all of them"
+    )
+
+
+# Query parameters of /recipes
+class RecipeQuery(RecipeFilter):
+    limit: int = Field(10, description="Number of random recipes to return")
+    ingredients: Optional[List[str]] = Field(
+        None, description="Filter recipes by ingredients"
+    )
+
+
+# Maximum number of ids accepted by the batch endpoint
+RECIPE_BATCH_MAX_IDS = 100
+
+
+class RecipeBatchRequest(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=RECIPE_BATCH_MAX_IDS)
+
+
+class RecipeBatchResponse(BaseModel):
+    recipes: List[Recipe] = []
+    missing: List[int] = []
+
+
 class AgentMessage(BaseModel):
     user_message: str
     user_id: int
@@ -0,0 +1,122 @@
+"""Pre-fork production server.
+
+Imports the application once in the parent, so the FAISS index and the agent
+are loaded a single time and shared copy-on-write with the workers. Each
+worker runs its own uvicorn server on the shared socket and creates the ONNX
+session after the fork. ONNX and FAISS get one thread per core of its share.
+
+Configured with environment variables:
+
+- WEB_CONCURRENCY: number of workers (default: number of usable cores)
+- HOST, PORT: listen address (default: 0.0.0.0:8000)
+- WORKER_THREADS: ONNX and FAISS threads per worker (default: its share of cores)
+"""
+import gc
+import os
+import signal
+import time
+import traceback
+
+import uvicorn
+
+
+def usable_cores() -> list[int]:
+    """Cores this process may run on, respecting container cpusets"""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def worker_cores(cores: list[int], workers: int, number: int) -> list[int]:
+    """Split cores evenly between workers, so inference thread pools don't
+    oversubscribe the machine"""
+    if workers >= len(cores):
+        return [cores[number % len(cores)]]
+    share, extra = divmod(len(cores), workers)
+    # The first `extra` workers take one of the remainder cores each
+    start = number * share + min(number, extra)
+    return cores[start : start + share + (number < extra)]
+
+
+def run_worker(config: uvicorn.Config, sock, cores: list[int]):
+    """Entry point of a forked worker process"""
+    # Pin and size the thread pools before the app lifespan creates them, so
+    # workers don't compete for cores
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+    # Read by RAGAgent.init_worker in the app lifespan
+    os.environ.setdefault("WORKER_THREADS", str(len(cores)))
+
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def main():
+    cores = usable_cores()
+    workers = max(1, int(os.getenv("WEB_CONCURRENCY", len(cores))))
+    host = os.getenv("HOST", "0.0.0.0")
+    port = int(os.getenv("PORT", "8000"))
+
+    # Load read-only state once, before forking
+    from playful_chef_api.main import app
+
+    config = uvicorn.Config(app, host=host, port=port)
+    sock = config.bind_socket()
+
+    # Keep preloaded objects out of the collector, otherwise gc passes in the
+    # workers touch their pages and undo copy-on-write sharing
+    gc.freeze()
+
+    children = {}
+    stopping = False
+
+    def spawn(number: int):
+        pid = os.fork()
+        if pid == 0:
+            # Drop the parent's stop() handler before anything else, it would
+            # signal the siblings from this process's copy of children
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            code = 1
+            try:
+                run_worker(config, sock, worker_cores(cores, workers, number))
+                code = 0
+            except Exception:
+                traceback.print_exc()
+            finally:
+                os._exit(code)
+        children[pid] = number
+        # stop() may have run while forking, before the pid was registered
+        if stopping:
+            os.kill(pid, signal.SIGTERM)
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            os.kill(pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    print(f"Starting {workers} workers on {host}:{port}")
+    for number in range(workers):
+        spawn(number)
+
+    # Supervise workers, restarting the ones that die unexpectedly
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        number = children.pop(pid, None)
+        if number is not None and not stopping:
+            print(f"Worker {pid} exited with status {status}, restarting")
+            time.sleep(1)
+            if not stopping:
+                spawn(number)
+
+    sock.close()
+
+
+if __name__ == "__main__":
+    main()